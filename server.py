@@ -12,17 +12,38 @@ Minimal FetchSERP MCP server:
 Env:
 - FETCHSERP_API_TOKEN required
 - FETCHSERP_BASE_URL optional. Defaults to https://www.fetchserp.com
+- FETCHSERP_CACHE_TTL optional. Seconds to cache upstream GET responses, 0 disables. Defaults to 300
+- FETCHSERP_CACHE_MAX_BYTES optional. Per-process size limit for cached response bodies. Defaults to 33554432 (32 MiB)
+- FETCHSERP_CONCURRENCY optional. Max in-flight FetchSERP requests per process. Defaults to 20
+- FETCHSERP_MAX_CONNECTIONS optional. Upstream connection pool size. Defaults to 100
+- FETCHSERP_KEEPALIVE optional. Idle upstream connections kept open. Defaults to 20
+- FETCHSERP_KEEPALIVE_EXPIRY optional. Seconds an idle upstream connection is kept. Defaults to 30
+- FETCHSERP_VALIDATE_JSON optional. Set to 1 to parse upstream bodies before passing them through
+- HTTPS_PROXY / HTTP_PROXY / ALL_PROXY, NO_PROXY optional. Egress proxy for FetchSERP calls
+- WEB_CONCURRENCY optional. Worker processes for python server.py. Defaults to 2
+- CORS_ORIGINS optional. Comma-separated allowed browser origins, empty disables CORS. Defaults to *
 
 Run:
-uvicorn server_min_kv_fetch:app --host 0.0.0.0 --port $PORT
+python server.py  (or: uvicorn server:app --host 0.0.0.0 --port $PORT --workers N)
 """
+import asyncio
+import hashlib
 import os
-import json
-from typing import Any, Dict, Optional
+import random
+import time
+import urllib.request
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 import httpx
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 APP_NAME = "FetchSERP MCP Server - Minimal KV+Fetch"
 APP_VERSION = "0.2.0"
@@ -34,33 +55,150 @@ SUPPORTED_PROTOCOLS = {LATEST_PROTOCOL, "2025-03-26", "2024-11-05"}
 # Config
 FETCHSERP_API_TOKEN = os.getenv("FETCHSERP_API_TOKEN")
 FETCHSERP_BASE_URL = os.getenv("FETCHSERP_BASE_URL", "https://www.fetchserp.com")
+FETCHSERP_CACHE_TTL = int(os.getenv("FETCHSERP_CACHE_TTL", "300"))
+FETCHSERP_CACHE_MAX_BYTES = int(os.getenv("FETCHSERP_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+FETCHSERP_CONCURRENCY = int(os.getenv("FETCHSERP_CONCURRENCY", "20"))
+FETCHSERP_MAX_CONNECTIONS = int(os.getenv("FETCHSERP_MAX_CONNECTIONS", "100"))
+FETCHSERP_KEEPALIVE = int(os.getenv("FETCHSERP_KEEPALIVE", "20"))
+FETCHSERP_KEEPALIVE_EXPIRY = float(os.getenv("FETCHSERP_KEEPALIVE_EXPIRY", "30"))
+FETCHSERP_VALIDATE_JSON = os.getenv("FETCHSERP_VALIDATE_JSON", "").lower() in ("1", "true", "yes")
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
+
+# -------------- Upstream client --------------
+# One pooled client per process so keep-alive connections to FetchSERP are
+# reused across tool calls instead of paying a TCP+TLS handshake every time.
+_AUTH_HEADERS = {"Authorization": f"Bearer {FETCHSERP_API_TOKEN}"} if FETCHSERP_API_TOKEN else {}
+
+def _upstream_proxy() -> Optional[httpx.Proxy]:
+    # An explicit transport skips httpx's trust_env proxy lookup, so the
+    # standard proxy variables are resolved here for the FetchSERP host.
+    url = urlsplit(FETCHSERP_BASE_URL)
+    if urllib.request.proxy_bypass(url.hostname or ""):
+        return None
+    proxies = urllib.request.getproxies()
+    proxy_url = proxies.get(url.scheme) or proxies.get("all")
+    if not proxy_url:
+        return None
+    # SOCKS would need the socksio extra; fail with a clear message instead
+    if urlsplit(proxy_url).scheme not in ("http", "https"):
+        raise RuntimeError(f"Unsupported proxy scheme in {proxy_url!r}, use an http:// or https:// proxy")
+    # httpx < 0.26 transports only accept a Proxy object, not a URL string
+    return httpx.Proxy(proxy_url)
+
+def _new_client() -> httpx.AsyncClient:
+    # Pool settings live on the transport, which also retries failed connects
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        proxy=_upstream_proxy(),
+        limits=httpx.Limits(
+            max_keepalive_connections=FETCHSERP_KEEPALIVE,
+            max_connections=FETCHSERP_MAX_CONNECTIONS,
+            keepalive_expiry=FETCHSERP_KEEPALIVE_EXPIRY,
+        ),
+    )
+    return httpx.AsyncClient(
+        base_url=FETCHSERP_BASE_URL,
+        headers=_AUTH_HEADERS,
+        timeout=httpx.Timeout(60.0, connect=3.0, write=5.0, pool=5.0),
+        transport=transport,
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fail at boot rather than on every tool call
+    if not FETCHSERP_API_TOKEN:
+        raise RuntimeError("FETCHSERP_API_TOKEN is not set")
+    app.state.http = _new_client()
+    # Open a pooled connection (DNS, TCP, TLS) before the first tool call needs
+    # one; any failure just means that call pays the setup cost instead. The
+    # overall deadline also covers the transport's connect retries.
+    try:
+        await asyncio.wait_for(app.state.http.head("/"), timeout=3.0)
+    except (httpx.HTTPError, asyncio.TimeoutError):
+        pass
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
 
 # FastAPI app
-app = FastAPI(title=APP_NAME)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-@app.middleware("http")
-async def add_protocol_header(request: Request, call_next):
-    resp = await call_next(request)
-    resp.headers["MCP-Protocol-Version"] = LATEST_PROTOCOL
-    return resp
+app = FastAPI(title=APP_NAME, lifespan=lifespan)
+
+# ChatGPT connectors call server-to-server, so CORS is only needed for browser
+# clients; an empty CORS_ORIGINS leaves the middleware out of the stack.
+if CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["GET", "HEAD", "POST", "OPTIONS"],
+        allow_headers=["Content-Type", "Authorization", "MCP-Protocol-Version", "Mcp-Session-Id"],
+    )
+
+# Scraped pages are large, highly compressible text
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
+# Plain ASGI rather than @app.middleware("http"): BaseHTTPMiddleware runs every
+# request through an extra task and memory stream just to set one header.
+class ProtocolHeaderMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                MutableHeaders(scope=message)["MCP-Protocol-Version"] = LATEST_PROTOCOL
+            await send(message)
+
+        await self.app(scope, receive, send_with_header)
+
+app.add_middleware(ProtocolHeaderMiddleware)
 
 # -------------- Health and banners --------------
-@app.get("/")
-async def root():
-    return {
+# Banner bodies never change, so they are encoded once
+_ROOT_BYTES = orjson.dumps(
+    {
         "ok": True,
         "app": APP_NAME,
         "version": APP_VERSION,
         "mcp": {"protocolRevision": LATEST_PROTOCOL, "endpoints": ["/mcp", "/mcp/"]},
     }
+)
+_MCP_BANNER_BYTES = orjson.dumps(
+    {"ok": True, "message": "MCP JSON-RPC endpoint. Use POST to call JSON-RPC.", "methods": ["POST"]}
+)
+
+_ROOT_ETAG = f'"{hashlib.sha1(_ROOT_BYTES).hexdigest()}"'
+_MCP_BANNER_ETAG = f'"{hashlib.sha1(_MCP_BANNER_BYTES).hexdigest()}"'
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2), so W/ is ignored
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+def _static_json(request: Request, body: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/")
+async def root(request: Request):
+    return _static_json(request, _ROOT_BYTES, _ROOT_ETAG)
 
 @app.head("/")
 async def head_root():
@@ -68,22 +206,33 @@ async def head_root():
 
 @app.get("/mcp")
 @app.get("/mcp/")
-async def mcp_banner():
-    return {"ok": True, "message": "MCP JSON-RPC endpoint. Use POST to call JSON-RPC.", "methods": ["POST"]}
+async def mcp_banner(request: Request):
+    return _static_json(request, _MCP_BANNER_BYTES, _MCP_BANNER_ETAG)
 
 @app.head("/mcp")
 @app.head("/mcp/")
 async def mcp_head():
     return Response(status_code=204)
 
-# -------------- Helpers --------------
-def _client() -> httpx.AsyncClient:
-    headers = {}
-    if FETCHSERP_API_TOKEN:
-        headers["Authorization"] = f"Bearer {FETCHSERP_API_TOKEN}"
-    return httpx.AsyncClient(base_url=FETCHSERP_BASE_URL, headers=headers, timeout=60.0)
+_HEALTH_OK_BYTES = orjson.dumps({"ok": True, "upstream": "reachable"})
+_HEALTH_DOWN_BYTES = orjson.dumps({"ok": False, "upstream": "unreachable"})
+
+@app.get("/health")
+async def health():
+    # Real readiness check over the pooled connection; any HTTP reply counts.
+    # wait_for bounds the whole probe, connect retries included, to 1s.
+    try:
+        await asyncio.wait_for(app.state.http.head("/"), timeout=1.0)
+    except (httpx.HTTPError, asyncio.TimeoutError):
+        return Response(
+            content=_HEALTH_DOWN_BYTES,
+            media_type="application/json",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    return Response(content=_HEALTH_OK_BYTES, media_type="application/json")
 
-def _jsonrpc_result(id_value: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+# -------------- Helpers --------------
+def _jsonrpc_result(id_value: Any, result: Any) -> Dict[str, Any]:
     return {"jsonrpc": "2.0", "id": id_value, "result": result}
 
 def _jsonrpc_error(id_value: Any, code: int, message: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -125,60 +274,191 @@ def _tools_list_result() -> Dict[str, Any]:
         ]
     }
 
-async def _call_fetchserp(path: str, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    async with _client() as client:
-        if method == "GET":
-            r = await client.get(path, params=params)
+# The tool catalogue is static, so encode it once and splice the bytes into
+# every tools/list reply as a pre-serialized fragment.
+_TOOLS_LIST = orjson.Fragment(orjson.dumps(_tools_list_result()))
+
+# Bounds concurrent upstream calls (e.g. from JSON-RPC batches) so bursts are
+# throttled here rather than rejected by FetchSERP with 429s.
+_UPSTREAM_SEM = asyncio.Semaphore(FETCHSERP_CONCURRENCY)
+
+_RETRY_ATTEMPTS = 3
+
+# Non-2xx FetchSERP replies are returned as values rather than raised, which
+# keeps exception construction and traceback capture off the error path.
+class _UpstreamError(NamedTuple):
+    status: int
+    body: str
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Upstream JSON is returned as text and embedded as-is; decoding it here would
+# only be undone by re-encoding it into the tool result.
+async def _send_with_retries(path: str, method: str, params: Dict[str, Any]) -> Union[str, _UpstreamError]:
+    client: httpx.AsyncClient = app.state.http
+    # Only GETs are safe to replay
+    attempts = _RETRY_ATTEMPTS if method == "GET" else 1
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            async with _UPSTREAM_SEM:
+                if method == "GET":
+                    r = await client.get(path, params=params)
+                else:
+                    r = await client.post(path, json=params)
+        except httpx.PoolTimeout:
+            # Nothing was sent; a slot may free up on the next attempt
+            if last:
+                raise
+        except (httpx.ConnectError, httpx.TimeoutException):
+            # Connects are already retried by the transport, and a call that
+            # used up its read or write timeout would only take as long again
+            # (and bill another scrape) on replay.
+            raise
+        except httpx.TransportError:
+            if last:
+                raise
         else:
-            r = await client.post(path, json=params)
-        r.raise_for_status()
-        return r.json()
+            # Redirects are not followed, so a 3xx is an error like any other non-2xx
+            if r.is_success:
+                break
+            if last or r.status_code not in _RETRY_STATUSES:
+                return _UpstreamError(r.status_code, r.text)
+        # Exponential backoff with full jitter, capped at 2s
+        await asyncio.sleep(random.uniform(0, min(2.0, 0.2 * 2 ** attempt)))
+    if FETCHSERP_VALIDATE_JSON:
+        orjson.loads(r.content)
+    return r.text
+
+# After `threshold` consecutive failed calls (transport errors, or 429/5xx that
+# survived the retries) the breaker opens for `cooldown` seconds and calls fail
+# immediately, so an outage doesn't pile up slow awaits on every worker. Once
+# the cooldown passes, a single trial call goes upstream: success closes the
+# breaker, failure reopens it, and everyone else keeps failing fast meanwhile.
+class _CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def allow(self) -> bool:
+        if self.failures < self.threshold:
+            return True
+        now = time.monotonic()
+        if now < self.open_until:
+            return False
+        # Half-open: this caller is the trial. Pushing open_until forward fails
+        # the rest fast until it records, or lets another trial through if it
+        # never does (e.g. cancelled).
+        self.open_until = now + self.cooldown
+        return True
+
+    def record(self, ok: bool) -> None:
+        if ok:
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.open_until = time.monotonic() + self.cooldown
+
+_BREAKER = _CircuitBreaker(threshold=5, cooldown=10.0)
+_BREAKER_OPEN_RESULT = _UpstreamError(503, '{"error":"FetchSERP unavailable, retry shortly"}')
+
+async def _request_fetchserp(path: str, method: str, params: Dict[str, Any]) -> Union[str, _UpstreamError]:
+    if not _BREAKER.allow():
+        return _BREAKER_OPEN_RESULT
+    try:
+        result = await _send_with_retries(path, method, params)
+    except httpx.TransportError:
+        _BREAKER.record(ok=False)
+        raise
+    _BREAKER.record(ok=not (isinstance(result, _UpstreamError) and result.status in _RETRY_STATUSES))
+    return result
+
+# Successful GETs are memoized for FETCHSERP_CACHE_TTL seconds. Concurrent misses
+# on the same key share one in-flight task, so only one of them goes upstream.
+# Scraped pages can be hundreds of KB each, so the cache is bounded by body size
+# (characters, close enough to bytes for HTML/JSON) rather than entry count.
+_CACHE: TTLCache = TTLCache(maxsize=max(FETCHSERP_CACHE_MAX_BYTES, 1), ttl=max(FETCHSERP_CACHE_TTL, 1), getsizeof=len)
+_INFLIGHT: Dict[Tuple[str, bytes], "asyncio.Task[Union[str, _UpstreamError]]"] = {}
+
+async def _fetch_and_cache(key: Tuple[str, bytes], path: str, params: Dict[str, Any]) -> Union[str, _UpstreamError]:
+    text = await _request_fetchserp(path, "GET", params)
+    # TTLCache raises on a single value larger than the whole cache
+    if not isinstance(text, _UpstreamError) and len(text) <= _CACHE.maxsize:
+        _CACHE[key] = text
+    return text
+
+async def _call_fetchserp(path: str, method: str, params: Dict[str, Any]) -> Union[str, _UpstreamError]:
+    if method != "GET" or FETCHSERP_CACHE_TTL <= 0:
+        return await _request_fetchserp(path, method, params)
+
+    key = (path, orjson.dumps(params, option=orjson.OPT_SORT_KEYS))
+    text = _CACHE.get(key)
+    if text is not None:
+        return text
+
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_cache(key, path, params))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    # Shielded so one caller disconnecting doesn't cancel the fetch for the rest
+    return await asyncio.shield(task)
 
 # -------------- Tool execution --------------
-async def _handle_tool_call(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-    if not FETCHSERP_API_TOKEN:
-        raise RuntimeError("FETCHSERP_API_TOKEN is not set")
-
-    if name == "search":
-        # Keyword volume
-        keyword = arguments.get("keyword")
-        if not keyword:
-            return {"content": [{"type": "text", "text": json.dumps({"error": "missing keyword"}, ensure_ascii=False)}]}
-
-        params = {
-            "keyword": keyword,
-            "country": arguments.get("country", "us"),
-            "language": arguments.get("language", "en"),
-        }
-        data = await _call_fetchserp("/api/v1/keywords_search_volume", "GET", params)
-        # Pass through upstream response
-        return {"content": [{"type": "text", "text": json.dumps(data, ensure_ascii=False)}]}
-
-    if name == "fetch":
-        url = arguments.get("url")
-        if not url:
-            return {"content": [{"type": "text", "text": json.dumps({"error": "missing url"}, ensure_ascii=False)}]}
-        data = await _call_fetchserp("/api/v1/scrape", "GET", {"url": url})
-        return {"content": [{"type": "text", "text": json.dumps(data, ensure_ascii=False)}]}
-
-    return {"content": [{"type": "text", "text": json.dumps({"error": f"Unknown tool: {name}"}, ensure_ascii=False)}]}
+def _text_result(payload: Any) -> Dict[str, Any]:
+    return {"content": [{"type": "text", "text": orjson.dumps(payload).decode()}]}
+
+def _passthrough_result(text: str) -> Dict[str, Any]:
+    return {"content": [{"type": "text", "text": text}]}
+
+# Fixed replies are built once; results are only serialized, never mutated.
+_MISSING_KEYWORD_RESULT = _text_result({"error": "missing keyword"})
+_MISSING_URL_RESULT = _text_result({"error": "missing url"})
+
+# name -> (path, {param: default}, required param, reply when it is missing).
+# Only declared params are forwarded, matching additionalProperties: false.
+_TOOL_ENDPOINTS: Dict[str, Tuple[str, Dict[str, Any], str, Dict[str, Any]]] = {
+    "search": (
+        "/api/v1/keywords_search_volume",
+        {"keyword": None, "country": "us", "language": "en"},
+        "keyword",
+        _MISSING_KEYWORD_RESULT,
+    ),
+    "fetch": ("/api/v1/scrape", {"url": None}, "url", _MISSING_URL_RESULT),
+}
+
+async def _handle_tool_call(name: Any, arguments: Dict[str, Any]) -> Union[Dict[str, Any], _UpstreamError]:
+    tool = _TOOL_ENDPOINTS.get(name) if isinstance(name, str) else None
+    if tool is None:
+        return _text_result({"error": f"Unknown tool: {name}"})
+
+    path, defaults, required, missing_result = tool
+    params = {k: arguments.get(k, v) for k, v in defaults.items()}
+    value = params[required]
+    # Blank strings would only buy a paid upstream call that cannot succeed
+    if not value or (isinstance(value, str) and not value.strip()):
+        return missing_result
+    text = await _call_fetchserp(path, "GET", params)
+    if isinstance(text, _UpstreamError):
+        return text
+    # Pass through upstream response
+    return _passthrough_result(text)
 
 # -------------- JSON-RPC dispatch --------------
-def _negotiate_protocol(client_ver: Optional[str]) -> str:
-    return client_ver if client_ver in SUPPORTED_PROTOCOLS else LATEST_PROTOCOL
-
-async def _dispatch(body: Dict[str, Any]) -> Dict[str, Any]:
-    method = body.get("method")
-    rid = body.get("id")
-    params = body.get("params") or {}
-
-    if method == "initialize":
-        client_ver = None
-        if isinstance(params, dict):
-            client_ver = params.get("protocolVersion") or params.get("protocol_version")
-        version = _negotiate_protocol(client_ver)
-        return _jsonrpc_result(
-            rid,
+def _negotiate_protocol(client_ver: Any) -> str:
+    # Lists and dicts are unhashable, so check the type before the set lookup
+    if isinstance(client_ver, str) and client_ver in SUPPORTED_PROTOCOLS:
+        return client_ver
+    return LATEST_PROTOCOL
+
+# Replies that only vary by request id are encoded once at import; the
+# initialize result is keyed by negotiated protocol version.
+_INITIALIZE_RESULTS = {
+    version: orjson.Fragment(
+        orjson.dumps(
             {
                 "protocolVersion": version,
                 "capabilities": {
@@ -187,54 +467,133 @@ async def _dispatch(body: Dict[str, Any]) -> Dict[str, Any]:
                     "prompts": {},
                 },
                 "serverInfo": {"name": APP_NAME, "version": APP_VERSION},
-            },
+            }
         )
-
-    if method in ("tools/list", "tools.list"):
-        return _jsonrpc_result(rid, _tools_list_result())
-
-    # Optional features: return empty lists instead of method not found
-    if method in ("resources/list", "resources.list"):
-        return _jsonrpc_result(rid, {"resources": []})
-    if method in ("prompts/list", "prompts.list"):
-        return _jsonrpc_result(rid, {"prompts": []})
-
-    if method in ("tools/call", "tools.call"):
-        name = params.get("name")
-        arguments = params.get("arguments") or {}
-        try:
-            result = await _handle_tool_call(name, arguments)
-            return _jsonrpc_result(rid, result)
-        except httpx.HTTPStatusError as e:
-            return _jsonrpc_error(rid, -32001, "Upstream FetchSERP error", {"status": e.response.status_code, "body": e.response.text})
-        except Exception as e:
-            return _jsonrpc_error(rid, -32000, f"Server error: {str(e)}")
-
-    return _jsonrpc_error(rid, -32601, f"Method not found: {method}")
+    )
+    for version in SUPPORTED_PROTOCOLS
+}
+_RESOURCES_LIST = orjson.Fragment(orjson.dumps({"resources": []}))
+_PROMPTS_LIST = orjson.Fragment(orjson.dumps({"prompts": []}))
+
+async def _do_initialize(rid: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    client_ver = None
+    if isinstance(params, dict):
+        client_ver = params.get("protocolVersion") or params.get("protocol_version")
+    version = _negotiate_protocol(client_ver)
+    return _jsonrpc_result(rid, _INITIALIZE_RESULTS[version])
+
+async def _do_tools_list(rid: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _jsonrpc_result(rid, _TOOLS_LIST)
+
+# Optional features: return empty lists instead of method not found
+async def _do_resources_list(rid: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _jsonrpc_result(rid, _RESOURCES_LIST)
+
+async def _do_prompts_list(rid: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _jsonrpc_result(rid, _PROMPTS_LIST)
+
+async def _do_tools_call(rid: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    name = params.get("name")
+    arguments = params.get("arguments") or {}
+    if not isinstance(arguments, dict):
+        return _jsonrpc_error(rid, -32602, "Invalid params")
+    try:
+        result = await _handle_tool_call(name, arguments)
+    except Exception as e:
+        return _jsonrpc_error(rid, -32000, f"Server error: {str(e)}")
+    if isinstance(result, _UpstreamError):
+        return _jsonrpc_error(rid, -32001, "Upstream FetchSERP error", {"status": result.status, "body": result.body})
+    return _jsonrpc_result(rid, result)
+
+# Both slash and dot spellings are accepted for compatibility.
+_METHODS = {
+    "initialize": _do_initialize,
+    "tools/list": _do_tools_list,
+    "tools.list": _do_tools_list,
+    "resources/list": _do_resources_list,
+    "resources.list": _do_resources_list,
+    "prompts/list": _do_prompts_list,
+    "prompts.list": _do_prompts_list,
+    "tools/call": _do_tools_call,
+    "tools.call": _do_tools_call,
+}
+
+async def _dispatch(body: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(body, dict):
+        return _jsonrpc_error(None, -32600, "Invalid Request")
+    method = body.get("method")
+    if not isinstance(method, str):
+        return _jsonrpc_error(None, -32600, "Invalid Request")
+    # Notifications (no id) get no reply. None of the ones MCP clients send,
+    # such as notifications/initialized, need any work here.
+    if "id" not in body:
+        return None
+    rid = body.get("id")
+    params = body.get("params")
+    if params is None:
+        params = {}
+    elif not isinstance(params, dict):
+        # Checked here so one malformed entry cannot fail its whole batch
+        return _jsonrpc_error(rid, -32602, "Invalid params")
+
+    handler = _METHODS.get(method)
+    if handler is None:
+        return _jsonrpc_error(rid, -32601, f"Method not found: {method}")
+    try:
+        return await handler(rid, params)
+    except Exception:
+        # Contained per entry so an unexpected failure cannot 500 a whole batch
+        return _jsonrpc_error(rid, -32603, "Internal error")
 
 # -------------- HTTP handlers --------------
+_PARSE_ERROR_BYTES = orjson.dumps(_jsonrpc_error(None, -32700, "Parse error"))
+
 @app.post("/mcp")
 @app.post("/mcp/")
 async def mcp_handler(request: Request) -> Response:
     try:
-        body = await request.json()
-    except Exception:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
         return Response(
-            content=json.dumps(_jsonrpc_error(None, -32700, "Parse error")),
+            content=_PARSE_ERROR_BYTES,
             media_type="application/json",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
-    result = await _dispatch(body)
-    return Response(content=json.dumps(result), media_type="application/json")
+    result: Union[Dict[str, Any], List[Dict[str, Any]], None]
+    if isinstance(body, list):
+        # JSON-RPC batch: run the calls concurrently, reply in request order
+        if not body:
+            result = _jsonrpc_error(None, -32600, "Invalid Request")
+        else:
+            replies = await asyncio.gather(*(_dispatch(item) for item in body))
+            result = [r for r in replies if r is not None] or None
+    else:
+        result = await _dispatch(body)
+    if result is None:
+        # Only notifications were sent: accepted, nothing to return
+        return Response(status_code=status.HTTP_202_ACCEPTED)
+    return Response(content=orjson.dumps(result), media_type="application/json")
 
 # For clients that post to root
-@app.post("/")
-async def mcp_root(request: Request) -> Response:
-    return await mcp_handler(request)
+app.add_api_route("/", mcp_handler, methods=["POST"], include_in_schema=False)
 
 if __name__ == "__main__":
     import uvicorn
-    if not FETCHSERP_API_TOKEN:
-        print("Warning: set FETCHSERP_API_TOKEN or search and fetch will fail at runtime")
-    print(f"Starting {APP_NAME} on 0.0.0.0:{os.getenv('PORT', '8000')}")
-    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8000")))
+    # Not os.cpu_count(): inside containers it reports the host's CPUs, and each
+    # worker carries its own cache and connection pool. The work is I/O-bound,
+    # so a couple of event loops go a long way; raise it explicitly if needed.
+    workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+    print(f"Starting {APP_NAME} on 0.0.0.0:{os.getenv('PORT', '8000')} with {workers} worker(s)")
+    # Import string so uvicorn can spawn workers; each builds its own client pool on startup
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=workers,
+        # "auto" picks uvloop and httptools when installed (uvicorn[standard]) and
+        # falls back to asyncio and h11 where they are not, e.g. on Windows
+        loop="auto",
+        http="auto",
+        log_level="warning",
+        access_log=False,
+    )